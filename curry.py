@@ -3,11 +3,12 @@
 import inspect
 import functools
 
-def curry(lazy = True, allow_override = False, use_defaults = False):
+def curry(lazy = True, allow_override = False, use_defaults = False, jit = False):
 	"""
-	Decorator to create curried versions of functions. Works with python 2 and 3.
+	Decorator to create curried versions of functions. Works with python 3.
 
-		Some examples: (for excessive examples see the testsuite at the bottom)
+		Some examples: (for excessive examples see the testsuite at the bottom,
+		which runs when executing this file)
 
 		>>> from curry import curry
 		>>> @curry()
@@ -33,6 +34,12 @@ def curry(lazy = True, allow_override = False, use_defaults = False):
 
 		Optionally uses the default parameters of the function.
 
+		Optionally compiles the function with numba.njit(cache=True), for numeric
+		functions that are evaluated in inner loops. The first evaluation for each
+		combination of argument types triggers compilation and is slow; the
+		compiled code is cached on disk for later runs. Falls back to the plain
+		function if numba is not installed. Bound methods are never compiled.
+
 		Decorate an existing function:
 
 		>>> def f(x,y):
@@ -80,28 +87,33 @@ def curry(lazy = True, allow_override = False, use_defaults = False):
 	ChangeLog:
 		2015-04-11 - initial implementation and testsuite
 		2016-08-29 - documentation and license cleanup for release on github
+		2026-10-15 - faster currying, drop python 2 support
 	"""
 
-	if not ((type(lazy) is bool) and (type(allow_override) is bool) and (type(use_defaults) is bool)):
+	if not ((type(lazy) is bool) and (type(allow_override) is bool) and (type(use_defaults) is bool) and (type(jit) is bool)):
 		raise TypeError("@curry used with bad parameters or none at all.")
 
 	def _specialized_curry(fun):
 		if not inspect.ismethod(fun) and not inspect.isfunction(fun):
 			raise TypeError("First argument must be a function or a bound method.")
-		try:
-			argspec = inspect.getfullargspec(fun)
-			if argspec.varargs is not None or argspec.varkw is not None:
-				raise TypeError("Currying variadic function {}() is ambiguous.".format(fun.__name__))
-		except AttributeError:
-			# compatibility for older versions of python
-			argspec = inspect.getargspec(fun)
-			if argspec.varargs is not None or argspec.keywords is not None:
-				raise TypeError("Currying variadic function {}() is ambiguous.".format(fun.__name__))
+		if inspect.ismethod(fun):
+			(fun_name, args_tuple, args_index, defaults, too_many_msg) = _analyze(fun.__func__, True)
+		else:
+			(fun_name, args_tuple, args_index, defaults, too_many_msg) = _analyze(fun, False)
+		n_args = len(args_tuple)
+		initial_pos = ()
 		if use_defaults:
-			initial_args = dict( (arg, val) for (arg, val) in zip(reversed(argspec.args), reversed(argspec.defaults)) )
+			initial_kw = defaults
+		else:
+			initial_kw = dict()
+		if jit and inspect.isfunction(fun):
+			target = _jit(fun)
 		else:
-			initial_args = dict()
-		return _curry_wrapper(fun, argspec, initial_args, lazy, allow_override)
+			target = fun
+		curried = _curry_wrapper(target, fun_name, too_many_msg, args_tuple, args_index, n_args, lazy, allow_override)(initial_pos, initial_kw)
+		# only the function handed out to the user carries the metadata of fun;
+		# intermediate curry-steps are plain closures.
+		return functools.wraps(fun)(curried)
 
 	return _specialized_curry
 
@@ -109,40 +121,118 @@ def curry(lazy = True, allow_override = False, use_defaults = False):
 
 # internals
 
-def _set_argument(fun, argspec, current_args, allow_override, new_arg, new_val):
-	if not new_arg in argspec.args:
-		raise TypeError("{}() got an unexpected keyword argument '{}'".format(fun.__name__, new_arg))
-	if new_arg in current_args and not allow_override:
-		raise TypeError("Curried function {}() does not allow overriding given parameter '{}'.".format(fun.__name__, new_arg))
-	current_args[new_arg] = new_val
-
-def _first_free_arg(fun, argspec, current_args):
-	if inspect.ismethod(fun):
-		valid_args = argspec.args[1:] # skip bound object for methods
+def _analyze(fun, is_method):
+	if inspect.isfunction(fun):
+		fun_name = fun.__name__
+		code = fun.__code__
+		variadic = code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+		(arg_names, args_tuple, args_index) = _analyze_code(code, is_method)
+		defaults = fun.__defaults__
+	else:
+		# other callables bound as methods, e.g. a functools.partial
+		fun_name = getattr(fun, "__name__", type(fun).__name__)
+		argspec = inspect.getfullargspec(fun)
+		variadic = argspec.varargs is not None or argspec.varkw is not None
+		(arg_names, args_tuple, args_index) = _split_args(tuple(argspec.args), is_method)
+		defaults = argspec.defaults
+	if variadic:
+		raise TypeError("Currying variadic function {}() is ambiguous.".format(fun_name))
+	defaults = defaults or ()
+	if defaults:
+		defaults = dict(zip(arg_names[-len(defaults):], defaults))
+	else:
+		defaults = dict()
+	too_many_msg = "{}() takes {} positional arguments but more were given".format(fun_name, len(arg_names))
+	return (fun_name, args_tuple, args_index, defaults, too_many_msg)
+
+# cached per code object, which holds no closure state and does not change.
+# name and defaults of a function can be reassigned, so they are read above.
+@functools.lru_cache(maxsize=1024)
+def _analyze_code(code, is_method):
+	return _split_args(code.co_varnames[:code.co_argcount], is_method)
+
+def _split_args(arg_names, is_method):
+	start_idx = 1 if is_method else 0 # skip bound object for methods
+	args_tuple = arg_names[start_idx:]
+	args_index = dict( (arg, idx) for (idx, arg) in enumerate(args_tuple) )
+	return (arg_names, args_tuple, args_index)
+
+def _jit(fun):
+	try:
+		import numba
+	except ImportError:
+		return fun
+	return numba.njit(cache=True)(fun)
+
+# The given arguments are kept as a tuple of positional values, which always
+# fills the leading slots of the function, plus a dict of keyword values for
+# slots behind those. Positional values that reach a slot already given by
+# keyword move that keyword value into the tuple, so the function can always
+# be called as fun(*pos, **kw). Once all slots are given, everything is in
+# the tuple.
+# Neither is ever modified once handed to a curry-step. The keyword mapping
+# is only copied when a call actually has to change it.
+
+def _set_keyword(args_index, fun_name, current_pos, current_kw, allow_override, new_arg, new_val):
+	if not new_arg in args_index:
+		raise TypeError("{}() got an unexpected keyword argument '{}'".format(fun_name, new_arg))
+	idx = args_index[new_arg]
+	in_pos = idx < len(current_pos)
+	if (in_pos or new_arg in current_kw) and not allow_override:
+		raise TypeError("Curried function {}() does not allow overriding given parameter '{}'.".format(fun_name, new_arg))
+	if in_pos:
+		current_pos[idx] = new_val
 	else:
-		valid_args = argspec.args
-	for arg in valid_args:
-		if not arg in current_args:
-			return arg;
-	raise TypeError("{}() takes {} positional arguments but more were given".format(fun.__name__, len(argspec.args)))
-
-def _curry_wrapper(fun, argspec, use_args, lazy, allow_override):
-	@functools.wraps(fun)
-	def _curried_fun(*args, **kwargs):
-		current_args = dict.copy(use_args)
-		def _inspect_args():
-			""" stub for debugging """
-			return current_args
-		if 0 == len(args) and 0 == len(kwargs):
-			return fun(**current_args)
-		for val in args:
-			_set_argument(fun, argspec, current_args, allow_override, _first_free_arg(fun, argspec, current_args), val)
-		for arg in kwargs:
-			_set_argument(fun, argspec, current_args, allow_override, arg, kwargs[arg])
-		if not lazy and (len(current_args) == len(argspec.args)):
-			return fun(**current_args)
-		return _curry_wrapper(fun, argspec, current_args, lazy, allow_override)
-	return _curried_fun
+		current_kw[new_arg] = new_val
+
+def _curry_wrapper(fun, fun_name, too_many_msg, args_tuple, args_index, n_args, lazy, allow_override):
+	# the settings of one decorated function are bound once here; each
+	# curry-step only adds a closure over its own arguments.
+	def _make_step(use_pos, use_kw):
+		def _curried_fun(*args, **kwargs):
+			if not args and not kwargs:
+				# use_pos and use_kw are never modified once captured
+				if use_kw:
+					return fun(*use_pos, **use_kw)
+				return fun(*use_pos)
+			if len(use_pos) + len(use_kw) + len(args) > n_args:
+				raise TypeError(too_many_msg)
+			current_kw = use_kw
+			if not use_kw:
+				# no slot is given by keyword, so positional values simply append
+				current_pos = use_pos + args
+			else:
+				current_pos = list(use_pos)
+				# the first free slot is always right behind the positional values,
+				# unless it has been given by keyword. There are enough free slots
+				# for all values, so this never runs past the last argument.
+				next_free = len(current_pos)
+				for val in args:
+					while args_tuple[next_free] in current_kw:
+						if current_kw is use_kw:
+							current_kw = dict(use_kw)
+						current_pos.append(current_kw.pop(args_tuple[next_free]))
+						next_free += 1
+					current_pos.append(val)
+					next_free += 1
+				current_pos = tuple(current_pos)
+			if kwargs:
+				current_pos = list(current_pos)
+				if current_kw is use_kw:
+					current_kw = dict(use_kw)
+				for arg in kwargs:
+					_set_keyword(args_index, fun_name, current_pos, current_kw, allow_override, arg, kwargs[arg])
+				current_pos = tuple(current_pos)
+			if current_kw and len(current_pos) + len(current_kw) == n_args:
+				# all slots are given: move the keyword values into the tuple, so
+				# fun can be called positionally, which binds much faster.
+				current_pos += tuple(map(current_kw.__getitem__, args_tuple[len(current_pos):]))
+				current_kw = {}
+			if not lazy and len(current_pos) == n_args:
+				return fun(*current_pos)
+			return _make_step(current_pos, current_kw)
+		return _curried_fun
+	return _make_step
 
 
 
@@ -266,6 +356,13 @@ def _testsuite():
 	m = I.sub_product(i)(11)(13)
 	if -172 != m():
 		raise Exception("Currying of unbound methods in class-definition does not work.")
+	if -166 != curry(lazy=False)(i.add_product)(2)(3):
+		raise Exception("Non-lazy currying of bound methods does not work.")
+	import types
+	def add(a, b):
+		return a+b
+	if 3 != curry()(types.MethodType(functools.partial(add), 1))(2)():
+		raise Exception("Currying of methods bound to other callables does not work.")
 
 	### check non-lazyness
 	@curry(lazy = False, allow_override = False, use_defaults = False)
@@ -322,11 +419,68 @@ def _testsuite():
 	if i(111,2,3,4)() != (111,2,3,4,5,6,7):
 		raise Exception("Default parameters are not used")
 
+	@curry(use_defaults = True)
+	def j(a,b):
+		return (a,b)
+
+	if j(1)(2)() != (1,2):
+		raise Exception("Using defaults of a function without defaults does not work.")
+
+	def k(a,b=1):
+		return (a,b)
+	curry(use_defaults = True)(k)
+	k.__defaults__ = (2,)
+	if curry(use_defaults = True)(k)(0)() != (0,2):
+		raise Exception("Changed default parameters are not used")
+
+	### jit compilation (or fallback without numba)
+	@curry(jit = True)
+	def n(a,b,c):
+		return a*b+c
+
+	if n(2)(3)(4)() != 10:
+		raise Exception("Jit-compiled currying gives bad result.")
+
+	### jit compilation with a stub numba, recording compilation and dispatch
+	import sys
+	import types
+	jit_calls = []
+	class Dispatcher():
+		def __init__(self, fun):
+			self.fun = fun
+		def __call__(self, *args, **kwargs):
+			jit_calls.append((args, kwargs))
+			return self.fun(*args, **kwargs)
+	def njit(**options):
+		jit_calls.append(options)
+		return Dispatcher
+	stub = types.ModuleType("numba")
+	stub.njit = njit
+	real_numba = sys.modules.get("numba")
+	sys.modules["numba"] = stub
+	try:
+		@curry(jit = True)
+		def o(a,b=2,c=3):
+			return (a,b,c)
+	finally:
+		if real_numba is None:
+			del sys.modules["numba"]
+		else:
+			sys.modules["numba"] = real_numba
+
+	if jit_calls != [{"cache": True}]:
+		raise Exception("Jit currying does not compile with numba.njit(cache=True).")
+	if o(1)(2)(3)() != (1,2,3) or jit_calls[-1] != ((1,2,3), {}):
+		raise Exception("Jit currying does not dispatch to the compiled function.")
+	if o(c=5)(1)() != (1,2,5) or jit_calls[-1] != ((1,), {"c": 5}):
+		raise Exception("Jit currying does not dispatch keyword parameters to the compiled function.")
+
 
 
-try:
-	_testsuite()
-except Exception:
-	print("ERROR: curry testsuite failed:")
-	raise
+if __name__ == "__main__":
+	try:
+		_testsuite()
+	except Exception:
+		print("ERROR: curry testsuite failed:")
+		raise
 